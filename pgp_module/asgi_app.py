@@ -0,0 +1,41 @@
+# asgi_app.py
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+import data_ingestion, realtime_updater
+from profile_store import ProfileStoreBusy
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+@app.post('/detect_transaction')
+async def detect_transaction(request: Request):
+    # Same contract as the Flask endpoint in app.py, with orjson on both ends
+    try:
+        tx_json = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        tx_json = None
+    if not tx_json or not isinstance(tx_json, dict):
+        return ORJSONResponse({"error": "Invalid JSON"}, status_code=400)
+    # Step 1: Ingest & preprocess
+    try:
+        tx = data_ingestion.parse_transaction(tx_json)
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=400)
+    # Step 2: Process through updater (which includes anomaly detection).
+    # A shared SQLite store may block on its file lock, so run it off the
+    # event loop; the in-memory store is cheap enough to run inline.
+    try:
+        if realtime_updater.profile_store.blocking:
+            anomaly_flag, score = await run_in_threadpool(
+                realtime_updater.process_new_transaction, tx)
+        else:
+            anomaly_flag, score = realtime_updater.process_new_transaction(tx)
+    except ProfileStoreBusy as e:
+        return ORJSONResponse({"error": str(e)}, status_code=503)
+    result = {
+        "user": tx["user"],
+        "anomaly": anomaly_flag,
+        "score": score
+    }
+    return ORJSONResponse(result, status_code=200)
@@ -0,0 +1,138 @@
+# bench_serving.py
+"""
+Compare requests/sec and tail latency of the Flask entry point (app.py)
+against the ASGI serving mode (serve.py) for /detect_transaction.
+
+Usage: python bench_serving.py [--requests 5000] [--concurrency 64] [--workers 4]
+
+The load generator runs on the same machine, so give it spare cores:
+--workers above (cores - 1) measures CPU contention, not the server.
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_payloads(n, users=200):
+    # Buyers move around a few home locations, with the odd far-away purchase
+    rng = random.Random(42)
+    homes = {u: (rng.uniform(1.2, 1.5), rng.uniform(103.6, 104.0)) for u in range(users)}
+    payloads = []
+    for _ in range(n):
+        user = rng.randrange(users)
+        lat, lon = homes[user]
+        if rng.random() < 0.05:
+            lat, lon = rng.uniform(-60, 60), rng.uniform(-180, 180)
+        payloads.append({
+            "timestamp": f"2025-06-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+            "latitude": lat + rng.uniform(-0.002, 0.002),
+            "longitude": lon + rng.uniform(-0.002, 0.002),
+            "buyer": f"user-{user}",
+            "seller": f"merchant-{rng.randrange(50)}",
+        })
+    return payloads
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.post(url, json={}, timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+async def run_load(url, payloads, concurrency):
+    latencies = []
+    errors = 0
+    queue = iter(payloads)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            for payload in queue:
+                start = time.perf_counter()
+                try:
+                    resp = await client.post(url, json=payload)
+                    if resp.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed, errors
+
+
+def percentile(sorted_values, pct):
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def report(name, latencies, elapsed, errors):
+    lat_ms = sorted(l * 1000 for l in latencies)
+    print(f"{name:<24} {len(lat_ms) / elapsed:>9.0f} req/s  "
+          f"p50 {percentile(lat_ms, 50):7.2f} ms  "
+          f"p95 {percentile(lat_ms, 95):7.2f} ms  "
+          f"p99 {percentile(lat_ms, 99):7.2f} ms  "
+          f"errors {errors}")
+
+
+def bench(name, cmd, port, payloads, concurrency, env=None):
+    proc = subprocess.Popen(cmd, cwd=HERE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{port}/detect_transaction"
+        wait_until_up(url)
+        # Warm up profiles and connections before measuring
+        asyncio.run(run_load(url, payloads[:concurrency * 4], concurrency))
+        report(name, *asyncio.run(run_load(url, payloads, concurrency)))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--requests", type=int, default=5000)
+    arg_parser.add_argument("--concurrency", type=int, default=64)
+    arg_parser.add_argument("--workers", type=int, default=4)
+    args = arg_parser.parse_args()
+
+    payloads = make_payloads(args.requests)
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+
+    # Both single-process baselines keep profiles in memory
+    memory_env = {k: v for k, v in os.environ.items() if k != "PGP_PROFILE_STORE"}
+
+    bench("flask (app.run)", [sys.executable, "app.py"], 5000, payloads, args.concurrency,
+          env=memory_env)
+
+    bench("asgi, 1 worker", [sys.executable, "serve.py", "--host", "127.0.0.1",
+                             "--port", "8001", "--workers", "1"],
+          8001, payloads, args.concurrency, env=memory_env)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "profiles.sqlite3")
+        bench(f"asgi, {args.workers} workers", [sys.executable, "serve.py", "--host", "127.0.0.1",
+                                                "--port", "8001", "--workers", str(args.workers),
+                                                "--profile-store", store],
+              8001, payloads, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
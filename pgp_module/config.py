@@ -1,3 +1,5 @@
+import os
+
 # Configuration parameters for DTG/PGP module
 
 # Clustering parameters
@@ -21,4 +23,8 @@ TIME_SLOTS = {
     "morning": range(6, 12),
     "afternoon": range(12, 18),
     "evening": range(18, 24),
-}
\ No newline at end of file
+}
+
+# Profile storage: path to a SQLite file shared by all server workers.
+# Unset keeps profiles in process memory (single worker only).
+PROFILE_STORE_PATH = os.environ.get("PGP_PROFILE_STORE")
@@ -2,6 +2,18 @@ import datetime
 from dateutil import parser
 
 
+def parse_timestamp(value: str) -> datetime.datetime:
+    """
+    Parse an ISO 8601 timestamp. Uses the C-implemented
+    datetime.fromisoformat and only falls back to dateutil
+    for forms it does not accept.
+    """
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return parser.isoparse(value)
+
+
 def parse_transaction(tx_json: dict) -> dict:
     """
     Validate and normalize incoming transaction JSON.
@@ -9,7 +21,7 @@ def parse_transaction(tx_json: dict) -> dict:
     Returns dict: {user, time, lat, lon, seller}
     """
     try:
-        ts = parser.isoparse(tx_json["timestamp"])
+        ts = parse_timestamp(tx_json["timestamp"])
     except Exception:
         raise ValueError("Invalid or missing 'timestamp' field")
     if not isinstance(tx_json.get("latitude"), (int, float)):
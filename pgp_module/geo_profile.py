@@ -51,6 +51,7 @@ class GeoProfile:
     def __init__(self, user_id):
         self.user_id = user_id
         self.clusters = []  # list of cluster dicts with center, weight, time_hist, etc.
+        self.global_time_hist = {}  # {(day_type, slot): count} across all transactions
         self.total_count = 0
     def build_from_history(self, transactions, eps=0.5, min_samples=3):
         # transactions: list of (lat, lon, timestamp) tuples
@@ -81,17 +82,56 @@ class GeoProfile:
         # Find nearest cluster within threshold
         lat, lon, ts = transaction["lat"], transaction["lon"], transaction["time"]
         # If within an existing cluster radius, update that cluster
-        closest = min(self.clusters, key=lambda c: haversine(c["center"], (lat,lon)))
+        slot = get_time_slot(ts)
+        closest = min(self.clusters, key=lambda c: haversine(c["center"], (lat,lon)), default=None)
         if closest and haversine(closest["center"], (lat,lon)) <= closest["radius"]:
             closest["count"] += 1
-            closest["time_hist"].update(ts)
+            closest["time_hist"][slot] = closest["time_hist"].get(slot, 0) + 1
         else:
             # create new cluster entry
             self.clusters.append({
                 "center": (lat, lon),
                 "radius": 0.1,  # start with a small radius
                 "count": 1,
-                "time_hist": {get_time_slot(ts): 1}
+                "time_hist": {slot: 1}
             })
+        self.global_time_hist[slot] = self.global_time_hist.get(slot, 0) + 1
         self.total_count += 1
-    
+
+    def to_dict(self):
+        """
+        Plain JSON-safe form of the profile, for shared profile stores.
+        Histogram keys (day_type, slot) are encoded as "day_type:slot".
+        """
+        return {
+            "user_id": self.user_id,
+            "clusters": [{
+                "center": [float(x) for x in c["center"]],
+                "radius": float(c["radius"]),
+                "count": float(c["count"]),
+                "time_hist": _encode_hist(c["time_hist"]),
+            } for c in self.clusters],
+            "global_time_hist": _encode_hist(self.global_time_hist),
+            "total_count": self.total_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls(data["user_id"])
+        profile.clusters = [{
+            "center": tuple(c["center"]),
+            "radius": c["radius"],
+            "count": c["count"],
+            "time_hist": _decode_hist(c["time_hist"]),
+        } for c in data["clusters"]]
+        profile.global_time_hist = _decode_hist(data["global_time_hist"])
+        profile.total_count = data["total_count"]
+        return profile
+
+
+def _encode_hist(hist):
+    return {f"{day_type}:{slot}": count for (day_type, slot), count in hist.items()}
+
+
+def _decode_hist(hist):
+    return {tuple(key.split(":", 1)): count for key, count in hist.items()}
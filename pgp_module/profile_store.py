@@ -0,0 +1,127 @@
+# profile_store.py
+import sqlite3
+import threading
+from collections import defaultdict
+
+import orjson
+
+from geo_profile import GeoProfile
+
+
+class ProfileStoreBusy(Exception):
+    """Raised when a profile could not be updated within the store's limits."""
+
+
+class MemoryProfileStore:
+    """
+    Per-process profile store. Fast, but every worker process
+    keeps its own copy of the profiles.
+    """
+    blocking = False  # never waits on I/O; safe to call from the event loop
+
+    def __init__(self):
+        self.profiles = {}
+        self._locks = defaultdict(threading.Lock)
+        self._guard = threading.Lock()
+
+    def update(self, user_id, fn):
+        """
+        Call fn(profile) on the (possibly new) profile under a per-user lock;
+        the profile is mutated in place. Returns fn's result.
+        """
+        with self._guard:
+            lock = self._locks[user_id]
+        with lock:
+            profile = self.profiles.get(user_id)
+            if profile is None:
+                profile = GeoProfile(user_id)
+                self.profiles[user_id] = profile
+            return fn(profile)
+
+    def users(self):
+        return list(self.profiles.keys())
+
+
+class SQLiteProfileStore:
+    """
+    Profile store backed by a SQLite file so several server workers
+    can share the same profiles.
+
+    Updates are optimistic and per user: the profile is read and fn runs
+    without holding any lock, then the write only succeeds if nobody else
+    changed that user's row in between (a version check), otherwise fn is
+    retried on the fresh profile. The database write lock is only held for
+    that single UPDATE, never while scoring.
+    """
+    blocking = True  # SQLite calls may wait on the file lock
+
+    def __init__(self, path, busy_timeout=0.2, max_retries=5):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.max_retries = max_retries
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS geo_profiles "
+            "(user_id TEXT PRIMARY KEY, profile BLOB NOT NULL, version INTEGER NOT NULL)"
+        )
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections are not thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def update(self, user_id, fn):
+        """
+        Call fn(profile) and persist the mutated profile.
+        Returns fn's result; raises ProfileStoreBusy if the write keeps
+        conflicting or the database stays locked.
+        """
+        conn = self._connect()
+        try:
+            for _ in range(self.max_retries):
+                row = conn.execute(
+                    "SELECT profile, version FROM geo_profiles WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                if row:
+                    profile = GeoProfile.from_dict(orjson.loads(row[0]))
+                else:
+                    profile = GeoProfile(user_id)
+                result = fn(profile)
+                blob = orjson.dumps(profile.to_dict())
+                if row:
+                    cur = conn.execute(
+                        "UPDATE geo_profiles SET profile = ?, version = version + 1 "
+                        "WHERE user_id = ? AND version = ?",
+                        (blob, user_id, row[1]),
+                    )
+                else:
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO geo_profiles (user_id, profile, version) "
+                        "VALUES (?, ?, 1)",
+                        (user_id, blob),
+                    )
+                if cur.rowcount == 1:
+                    return result
+        except sqlite3.OperationalError as e:
+            raise ProfileStoreBusy(str(e))
+        raise ProfileStoreBusy(f"profile {user_id!r} kept changing during update")
+
+    def users(self):
+        rows = self._connect().execute("SELECT user_id FROM geo_profiles").fetchall()
+        return [row[0] for row in rows]
+
+
+def create_store(path=None):
+    """
+    Return a SQLite-backed store when a path is given,
+    otherwise an in-process memory store.
+    """
+    if path:
+        return SQLiteProfileStore(path)
+    return MemoryProfileStore()
@@ -0,0 +1,40 @@
+# serve.py
+import argparse
+import os
+
+import uvicorn
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Production server for the PGP detector")
+    arg_parser.add_argument("--host", default="0.0.0.0")
+    arg_parser.add_argument("--port", type=int, default=8001)
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument("--keep-alive", type=int, default=30,
+                            help="seconds to hold idle keep-alive connections open")
+    arg_parser.add_argument("--profile-store", default=os.environ.get("PGP_PROFILE_STORE"),
+                            help="SQLite file shared by all workers for user profiles")
+    args = arg_parser.parse_args()
+
+    # Workers are separate processes; they must share one profile store
+    # or each would score against its own partial history.
+    if args.workers > 1 and not args.profile_store:
+        arg_parser.error("--profile-store (or PGP_PROFILE_STORE) is required when --workers > 1")
+    if args.profile_store:
+        # Read by config.py when each worker imports the app
+        os.environ["PGP_PROFILE_STORE"] = args.profile_store
+
+    uvicorn.run(
+        "asgi_app:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="auto",      # uvloop when installed
+        http="auto",      # httptools when installed
+        timeout_keep_alive=args.keep_alive,
+        access_log=False,
+    )
+
+
+if __name__ == '__main__':
+    main()
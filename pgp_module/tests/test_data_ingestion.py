@@ -0,0 +1,35 @@
+import datetime
+
+import pytest
+
+import data_ingestion
+
+
+def test_parse_timestamp_uses_fromisoformat():
+    ts = data_ingestion.parse_timestamp("2025-06-02T10:15:00+08:00")
+    assert ts == datetime.datetime(2025, 6, 2, 10, 15, tzinfo=datetime.timezone(datetime.timedelta(hours=8)))
+
+
+def test_parse_timestamp_falls_back_to_isoparse(monkeypatch):
+    calls = []
+    real_isoparse = data_ingestion.parser.isoparse
+    monkeypatch.setattr(data_ingestion.parser, "isoparse",
+                        lambda value: calls.append(value) or real_isoparse(value))
+    data_ingestion.parse_timestamp("2025-06-02T10:15:00")
+    assert calls == []
+    # Forms fromisoformat rejects (which ones depends on the Python version) go to dateutil
+    monkeypatch.setattr(data_ingestion.datetime, "datetime", _NoFromIsoformat)
+    assert data_ingestion.parse_timestamp("20250602T101500") == datetime.datetime(2025, 6, 2, 10, 15)
+    assert calls == ["20250602T101500"]
+
+
+class _NoFromIsoformat(datetime.datetime):
+    @classmethod
+    def fromisoformat(cls, value):
+        raise ValueError(value)
+
+
+def test_parse_transaction_rejects_bad_timestamp():
+    with pytest.raises(ValueError, match="timestamp"):
+        data_ingestion.parse_transaction(
+            {"timestamp": "not a date", "latitude": 1.3, "longitude": 103.8, "buyer": "a"})
@@ -0,0 +1,48 @@
+import datetime
+
+from geo_profile import GeoProfile
+
+MONDAY_MORNING = datetime.datetime(2025, 6, 2, 9, 0)
+
+
+def tx(lat, lon, ts=MONDAY_MORNING):
+    return {"lat": lat, "lon": lon, "time": ts}
+
+
+def test_first_transaction_creates_cluster():
+    profile = GeoProfile("u")
+    profile.update_with_transaction(tx(1.3, 103.8))
+    assert len(profile.clusters) == 1
+    assert profile.clusters[0]["center"] == (1.3, 103.8)
+    assert profile.clusters[0]["time_hist"] == {("weekday", "morning"): 1}
+    assert profile.global_time_hist == {("weekday", "morning"): 1}
+    assert profile.total_count == 1
+
+
+def test_nearby_transaction_updates_cluster_histograms():
+    profile = GeoProfile("u")
+    profile.update_with_transaction(tx(1.3, 103.8))
+    profile.update_with_transaction(tx(1.3, 103.8, datetime.datetime(2025, 6, 7, 20, 0)))
+    assert len(profile.clusters) == 1
+    assert profile.clusters[0]["count"] == 2
+    assert profile.clusters[0]["time_hist"] == {("weekday", "morning"): 1, ("weekend", "evening"): 1}
+    assert profile.global_time_hist == {("weekday", "morning"): 1, ("weekend", "evening"): 1}
+
+
+def test_far_transaction_starts_new_cluster():
+    profile = GeoProfile("u")
+    profile.update_with_transaction(tx(1.3, 103.8))
+    profile.update_with_transaction(tx(40.7, -74.0))
+    assert len(profile.clusters) == 2
+    assert profile.global_time_hist == {("weekday", "morning"): 2}
+
+
+def test_dict_round_trip():
+    profile = GeoProfile("u")
+    profile.update_with_transaction(tx(1.3, 103.8))
+    profile.update_with_transaction(tx(40.7, -74.0))
+    restored = GeoProfile.from_dict(profile.to_dict())
+    assert restored.user_id == "u"
+    assert restored.clusters == profile.clusters
+    assert restored.global_time_hist == profile.global_time_hist
+    assert restored.total_count == profile.total_count
@@ -0,0 +1,72 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from profile_store import MemoryProfileStore, ProfileStoreBusy, SQLiteProfileStore
+
+TX = {"lat": 1.3, "lon": 103.8, "time": datetime.datetime(2025, 6, 2, 9, 0)}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryProfileStore()
+    return SQLiteProfileStore(str(tmp_path / "profiles.sqlite3"))
+
+
+def test_update_persists_changes(store):
+    assert store.update("u", lambda p: p.update_with_transaction(TX) or "done") == "done"
+    store.update("u", lambda p: p.update_with_transaction(TX))
+    assert store.update("u", lambda p: p.total_count) == 2
+    assert store.users() == ["u"]
+
+
+def test_failed_update_is_not_committed(store):
+    store.update("u", lambda p: p.update_with_transaction(TX))
+
+    def fail(profile):
+        profile.update_with_transaction(TX)
+        raise RuntimeError("scoring failed")
+
+    with pytest.raises(RuntimeError):
+        store.update("u", fail)
+    if isinstance(store, SQLiteProfileStore):
+        assert store.update("u", lambda p: p.total_count) == 1
+
+
+def test_sqlite_shared_between_store_instances(tmp_path):
+    path = str(tmp_path / "profiles.sqlite3")
+    SQLiteProfileStore(path).update("u", lambda p: p.update_with_transaction(TX))
+    assert SQLiteProfileStore(path).update("u", lambda p: p.total_count) == 1
+
+
+def test_sqlite_retries_on_concurrent_write(tmp_path):
+    path = str(tmp_path / "profiles.sqlite3")
+    store, other = SQLiteProfileStore(path), SQLiteProfileStore(path)
+    store.update("u", lambda p: p.update_with_transaction(TX))
+    attempts = []
+
+    def racing(profile):
+        attempts.append(profile.total_count)
+        if len(attempts) == 1:
+            # Another worker commits between our read and our write
+            other.update("u", lambda p: p.update_with_transaction(TX))
+        profile.update_with_transaction(TX)
+
+    store.update("u", racing)
+    assert attempts == [1, 2]
+    assert store.update("u", lambda p: p.total_count) == 3
+
+
+def test_sqlite_gives_up_when_locked(tmp_path):
+    path = str(tmp_path / "profiles.sqlite3")
+    store = SQLiteProfileStore(path, busy_timeout=0.05)
+    store.update("u", lambda p: p.update_with_transaction(TX))
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(ProfileStoreBusy):
+            store.update("u", lambda p: p.update_with_transaction(TX))
+    finally:
+        blocker.execute("ROLLBACK")
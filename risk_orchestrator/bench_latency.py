@@ -0,0 +1,178 @@
+"""
+Local end-to-end latency of a payment authorization: the client calling
+geo, behavioral and (on step-up) face services serially, versus a single
+call to the orchestrator's /api/v1/authorize.
+
+Starts the pgp_module, user_behavioral_backend and orchestrator servers
+itself. Pass --face-image to also start TapiPay-FaceAuth and include
+the face match on step-up.
+
+Usage: python bench_latency.py [--requests 500] [--concurrency 8] [--face-image me.jpg]
+"""
+import argparse
+import asyncio
+import base64
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+import config
+from orchestrator import behavior_result, geo_result, needs_step_up
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_payloads(n, users=50):
+    rng = random.Random(7)
+    payloads = []
+    for _ in range(n):
+        user = f"user-{rng.randrange(users)}"
+        # Mostly home-area purchases; a few far away to trigger step-up
+        far = rng.random() < 0.1
+        keystrokes, t = [], 0.0
+        for key in "1234":
+            down = t + rng.uniform(0.08, 0.2)
+            t = down + rng.uniform(0.05, 0.1)
+            keystrokes.append({"key": key, "down_time": down, "up_time": t})
+        payloads.append({
+            "transaction": {
+                "timestamp": f"2025-06-{rng.randint(1, 28):02d}T{rng.randint(8, 20):02d}:00:00",
+                "latitude": rng.uniform(-60, 60) if far else 1.30 + rng.uniform(-0.002, 0.002),
+                "longitude": rng.uniform(-180, 180) if far else 103.8 + rng.uniform(-0.002, 0.002),
+                "buyer": user,
+                "seller": f"merchant-{rng.randrange(20)}",
+            },
+            "behavior": {
+                "user_id": user,
+                "session_id": f"s-{rng.randrange(10**6)}",
+                "keystrokes": keystrokes,
+                "touch_patterns": [{"x": 10.0, "y": 20.0, "pressure": 0.5,
+                                    "duration": rng.uniform(0.08, 0.15)}],
+                "geo_ip": "SG" if not far else "US",
+            },
+        })
+    return payloads
+
+
+async def serial_flow(client, payload, face_image):
+    # What the client does today: one round-trip per service, in order,
+    # with the orchestrator's step-up rule so both flows call face equally often
+    resp = await client.post(config.GEO_URL + "/detect_transaction", json=payload["transaction"])
+    resp.raise_for_status()
+    geo = dict(geo_result(resp.json()), status="ok")
+    resp = await client.post(config.BEHAVIOR_URL + "/api/v1/authenticate", json=payload["behavior"])
+    resp.raise_for_status()
+    behavior = dict(behavior_result(resp.json()), status="ok")
+    if face_image and needs_step_up(geo, behavior):
+        files = {"file": ("face.jpg", base64.b64decode(face_image), "image/jpeg")}
+        await client.post(config.FACE_URL + "/upload-face/", files=files)
+
+
+async def orchestrated_flow(client, url, payload, face_image):
+    body = dict(payload, face_image=face_image) if face_image else payload
+    resp = await client.post(url, json=body)
+    resp.raise_for_status()
+
+
+async def run_load(flow, payloads, concurrency):
+    latencies = []
+    queue = iter(payloads)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            for payload in queue:
+                start = time.perf_counter()
+                await flow(client, payload)
+                latencies.append(time.perf_counter() - start)
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def report(name, latencies):
+    lat_ms = sorted(l * 1000 for l in latencies)
+    pct = lambda p: lat_ms[min(len(lat_ms) - 1, int(round(p / 100 * (len(lat_ms) - 1))))]
+    print(f"{name:<14} p50 {pct(50):7.2f} ms  p95 {pct(95):7.2f} ms  "
+          f"p99 {pct(99):7.2f} ms  mean {sum(lat_ms) / len(lat_ms):7.2f} ms")
+
+
+def wait_until_up(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+def start_servers(with_face, orchestrator_port, scratch_dir):
+    uvicorn = [sys.executable, "-m", "uvicorn", "--log-level", "warning"]
+    # The behavioral backend keeps its SQLite db at ./test.db; run a copy so
+    # the fake benchmark users never land in the tracked database
+    behavior_dir = os.path.join(scratch_dir, "user_behavioral_backend")
+    shutil.copytree(os.path.join(ROOT, "user_behavioral_backend"), behavior_dir,
+                    ignore=shutil.ignore_patterns("test.db", "__pycache__"))
+    servers = [
+        (os.path.join(ROOT, "pgp_module"),
+         [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", "8001", "--workers", "1"],
+         config.GEO_URL),
+        (behavior_dir, uvicorn + ["main:app", "--port", "8002"], config.BEHAVIOR_URL),
+        (os.path.dirname(os.path.abspath(__file__)),
+         uvicorn + ["main:app", "--port", str(orchestrator_port)],
+         f"http://127.0.0.1:{orchestrator_port}"),
+    ]
+    if with_face:
+        servers.append((os.path.join(ROOT, "TapiPay-FaceAuth"),
+                        uvicorn + ["app.main:app", "--port", "8000"], config.FACE_URL))
+    procs = []
+    for cwd, cmd, url in servers:
+        procs.append(subprocess.Popen(cmd, cwd=cwd))
+        wait_until_up(url)
+    return procs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--requests", type=int, default=500)
+    arg_parser.add_argument("--concurrency", type=int, default=8)
+    arg_parser.add_argument("--port", type=int, default=8003, help="orchestrator port")
+    arg_parser.add_argument("--face-image", help="image sent for step-up face matching")
+    args = arg_parser.parse_args()
+
+    face_image = None
+    if args.face_image:
+        with open(args.face_image, "rb") as f:
+            face_image = base64.b64encode(f.read()).decode()
+
+    payloads = make_payloads(args.requests)
+    url = f"http://127.0.0.1:{args.port}/api/v1/authorize"
+    scratch_dir = tempfile.mkdtemp()
+    procs = start_servers(face_image is not None, args.port, scratch_dir)
+    try:
+        print(f"{args.requests} authorizations, concurrency {args.concurrency}, "
+              f"face match {'on' if face_image else 'off'}")
+        # Warm up profiles and connection pools first. One request per user,
+        # serially: the behavioral backend's first insert for a user is not
+        # safe against concurrent requests for that same user.
+        first_per_user = list({p["behavior"]["user_id"]: p for p in payloads}.values())
+        asyncio.run(run_load(lambda c, p: serial_flow(c, p, None), first_per_user, 1))
+        report("serial", asyncio.run(run_load(
+            lambda c, p: serial_flow(c, p, face_image), payloads, args.concurrency)))
+        report("orchestrated", asyncio.run(run_load(
+            lambda c, p: orchestrated_flow(c, url, p, face_image), payloads, args.concurrency)))
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import os
+
+# Configuration parameters for the risk-scoring orchestrator
+
+# Downstream services (each overridable through the environment)
+GEO_URL = os.environ.get("GEO_URL", "http://127.0.0.1:8001")            # pgp_module serve.py
+BEHAVIOR_URL = os.environ.get("BEHAVIOR_URL", "http://127.0.0.1:8002")  # user_behavioral_backend
+FACE_URL = os.environ.get("FACE_URL", "http://127.0.0.1:8000")          # TapiPay-FaceAuth
+
+# Per-signal timeouts in seconds; a signal that misses its deadline counts as high risk
+GEO_TIMEOUT = 0.25
+BEHAVIOR_TIMEOUT = 0.5
+FACE_TIMEOUT = 5.0
+
+# Connection pool shared by all requests
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 50
+
+# Combined risk = W_GEO * geo score + W_BEHAVIOR * (1 - behavioral confidence)
+W_GEO = 0.5
+W_BEHAVIOR = 0.5
+STEP_UP_THRESHOLD = 0.4      # combined risk at or above this requires a face match
+FACE_MIN_CONFIDENCE = 60.0   # FaceAuth confidence (percent) needed to pass step-up
@@ -0,0 +1,31 @@
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI
+
+import config
+from models import AuthorizeRequest
+from orchestrator import authorize
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled, keep-alive client for all downstream calls
+    limits = httpx.Limits(
+        max_connections=config.MAX_CONNECTIONS,
+        max_keepalive_connections=config.MAX_KEEPALIVE_CONNECTIONS,
+    )
+    app.state.client = httpx.AsyncClient(limits=limits)
+    yield
+    await app.state.client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/")
+def read_root():
+  return {"message" : "Risk orchestrator is running"}
+
+@app.post("/api/v1/authorize")
+async def authorize_payment(req: AuthorizeRequest):
+    return await authorize(app.state.client, req)
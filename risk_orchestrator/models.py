@@ -0,0 +1,23 @@
+from pydantic import BaseModel, model_validator  # for JSON validation
+from typing import Any, Dict, Optional
+
+# One payment authorization: the bodies the client used to send to each service
+class AuthorizeRequest(BaseModel):
+    transaction: Dict[str, Any]       # pgp_module /detect_transaction body
+    behavior: Dict[str, Any]          # user_behavioral_backend /api/v1/authenticate body
+    face_image: Optional[str] = None  # base64 image, only forwarded on step-up
+
+    # Both signals (and the face match) must be about the same person
+    @model_validator(mode="after")
+    def same_user(self):
+        buyer = self.transaction.get("buyer")
+        user_id = self.behavior.get("user_id")
+        if buyer is None or user_id is None:
+            raise ValueError("transaction.buyer and behavior.user_id are required")
+        if str(buyer) != str(user_id):
+            raise ValueError("transaction.buyer does not match behavior.user_id")
+        return self
+
+    @property
+    def user_id(self):
+        return str(self.behavior["user_id"])
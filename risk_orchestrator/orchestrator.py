@@ -0,0 +1,139 @@
+import asyncio
+import base64
+import binascii
+import time
+
+import httpx
+
+import config
+
+
+def geo_result(body):
+    # pgp_module /detect_transaction response -> signal result
+    return {"risk": float(body["score"]), "anomaly": bool(body["anomaly"])}
+
+
+def behavior_result(body):
+    # user_behavioral_backend /api/v1/authenticate response -> signal result
+    return {
+        "risk": round(1 - float(body["confidence_score"]), 3),
+        "risk_level": body["risk_level"],
+        "action": body["action"],
+    }
+
+
+async def geo_signal(client, transaction):
+    resp = await client.post(config.GEO_URL + "/detect_transaction", json=transaction)
+    resp.raise_for_status()
+    return geo_result(resp.json())
+
+
+async def behavior_signal(client, behavior):
+    resp = await client.post(config.BEHAVIOR_URL + "/api/v1/authenticate", json=behavior)
+    resp.raise_for_status()
+    return behavior_result(resp.json())
+
+
+async def face_signal(client, user_id, face_image):
+    files = {"file": ("face.jpg", base64.b64decode(face_image), "image/jpeg")}
+    resp = await client.post(config.FACE_URL + "/upload-face/", files=files)
+    resp.raise_for_status()
+    body = resp.json()
+    return {
+        "name": body["name"],
+        "confidence": body["confidence"],
+        "matched": body["name"] == user_id and body["confidence"] >= config.FACE_MIN_CONFIDENCE,
+    }
+
+
+async def run_signal(coro, timeout):
+    """
+    Await one signal under its own deadline.
+    Never raises: failures are reported in the result's status.
+    """
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(coro, timeout)
+        result["status"] = "ok"
+    except asyncio.TimeoutError:
+        result = {"status": "timeout"}
+    except (httpx.HTTPError, KeyError, TypeError, ValueError, binascii.Error) as e:
+        result = {"status": "error", "detail": str(e)}
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def signal_risk(result, optimistic):
+    # A pending signal (None) counts as risk-free when asking whether step-up
+    # is already certain; failed or timed-out signals always count as maximal.
+    if result is None:
+        return 0.0 if optimistic else 1.0
+    return result["risk"] if result["status"] == "ok" else 1.0
+
+
+def combined_risk(geo, behavior, optimistic=False):
+    risk = (config.W_GEO * signal_risk(geo, optimistic)
+            + config.W_BEHAVIOR * signal_risk(behavior, optimistic))
+    return round(risk, 3)
+
+
+def needs_step_up(geo, behavior, optimistic=False):
+    """
+    Step-up rule shared by the orchestrator and the serial benchmark flow.
+    A geo anomaly or the behavioral backend's own STEP_UP verdict forces
+    step-up; otherwise the combined risk decides.
+    """
+    if geo is not None and geo["status"] == "ok" and geo["anomaly"]:
+        return True
+    if behavior is not None and behavior["status"] == "ok" and behavior["action"] == "STEP_UP":
+        return True
+    return combined_risk(geo, behavior, optimistic) >= config.STEP_UP_THRESHOLD
+
+
+def _result(task):
+    return task.result() if task.done() else None
+
+
+async def authorize(client, req):
+    """
+    Fan out to the geo and behavioral scorers concurrently and combine
+    their risk. The face match is only called when step-up is required,
+    and is started as soon as one signal alone makes step-up certain.
+    Returns the decision dict served by /api/v1/authorize.
+    """
+    user_id = req.user_id
+    geo_task = asyncio.create_task(
+        run_signal(geo_signal(client, req.transaction), config.GEO_TIMEOUT))
+    behavior_task = asyncio.create_task(
+        run_signal(behavior_signal(client, req.behavior), config.BEHAVIOR_TIMEOUT))
+
+    face_task = None
+    pending = {geo_task, behavior_task}
+    while pending:
+        _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        # Short-circuit: start the slow face match without waiting for the other signal
+        if (face_task is None and req.face_image
+                and needs_step_up(_result(geo_task), _result(behavior_task), optimistic=True)):
+            face_task = asyncio.create_task(
+                run_signal(face_signal(client, user_id, req.face_image), config.FACE_TIMEOUT))
+
+    geo, behavior = geo_task.result(), behavior_task.result()
+    risk = combined_risk(geo, behavior)
+    signals = {"geo": geo, "behavior": behavior}
+
+    if not needs_step_up(geo, behavior):
+        action = "ALLOW"
+    elif face_task is None:
+        # No image supplied: the client must capture a face and retry
+        action = "STEP_UP"
+    else:
+        face = await face_task
+        signals["face"] = face
+        action = "ALLOW" if face["status"] == "ok" and face["matched"] else "DENY"
+
+    return {
+        "user": user_id,
+        "risk": risk,
+        "action": action,
+        "signals": signals,
+    }
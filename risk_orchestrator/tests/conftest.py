@@ -0,0 +1,5 @@
+import os
+import sys
+
+# risk_orchestrator uses flat imports (import config, ...), so run tests against its directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,12 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+def test_mismatched_user_is_422():
+    client = TestClient(app)
+    resp = client.post("/api/v1/authorize", json={
+        "transaction": {"buyer": "victim"},
+        "behavior": {"user_id": "attacker"},
+    })
+    assert resp.status_code == 422
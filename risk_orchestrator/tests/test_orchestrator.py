@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+import config
+import orchestrator
+from models import AuthorizeRequest
+
+CALLS = []
+
+
+def request(face_image="aW1n", buyer="alice", user_id="alice"):
+    return AuthorizeRequest(
+        transaction={"buyer": buyer, "latitude": 1.3, "longitude": 103.8},
+        behavior={"user_id": user_id},
+        face_image=face_image,
+    )
+
+
+def stub(monkeypatch, geo=None, behavior=None, face=None,
+         geo_delay=0.0, behavior_delay=0.0, face_delay=0.0):
+    """Replace the three HTTP signals with coroutines returning canned results."""
+    CALLS.clear()
+
+    def make(name, result, delay):
+        async def signal(*args):
+            CALLS.append(name + ":start")
+            await asyncio.sleep(delay)
+            if isinstance(result, Exception):
+                raise result
+            CALLS.append(name + ":done")
+            return dict(result)
+        return signal
+
+    monkeypatch.setattr(orchestrator, "geo_signal", make(
+        "geo", geo or {"risk": 0.1, "anomaly": False}, geo_delay))
+    monkeypatch.setattr(orchestrator, "behavior_signal", make(
+        "behavior", behavior or {"risk": 0.1, "risk_level": "LOW", "action": "ALLOW"}, behavior_delay))
+    monkeypatch.setattr(orchestrator, "face_signal", make(
+        "face", face or {"name": "alice", "confidence": 90.0, "matched": True}, face_delay))
+
+
+def authorize(req):
+    return asyncio.run(orchestrator.authorize(None, req))
+
+
+def test_low_risk_allows_without_face(monkeypatch):
+    stub(monkeypatch)
+    result = authorize(request())
+    assert result["action"] == "ALLOW"
+    assert result["risk"] == 0.1
+    assert "face:start" not in CALLS
+    assert "face" not in result["signals"]
+
+
+def test_behavioral_step_up_forces_face_match(monkeypatch):
+    # Low geo risk plus the lowest behavioral confidence stays under the
+    # threshold, but the backend's own STEP_UP verdict must still win
+    stub(monkeypatch, geo={"risk": 0.2, "anomaly": False},
+         behavior={"risk": 0.433, "risk_level": "HIGH", "action": "STEP_UP"})
+    result = authorize(request())
+    assert result["risk"] < config.STEP_UP_THRESHOLD
+    assert result["action"] == "ALLOW"
+    assert "face:start" in CALLS
+    assert result["signals"]["face"]["status"] == "ok"
+
+
+def test_step_up_without_image(monkeypatch):
+    stub(monkeypatch, geo={"risk": 0.9, "anomaly": True})
+    result = authorize(request(face_image=None))
+    assert result["action"] == "STEP_UP"
+    assert "face:start" not in CALLS
+
+
+def test_failed_face_match_denies(monkeypatch):
+    stub(monkeypatch, geo={"risk": 0.9, "anomaly": True},
+         face={"name": "mallory", "confidence": 95.0, "matched": False})
+    assert authorize(request())["action"] == "DENY"
+
+
+def test_face_error_denies(monkeypatch):
+    stub(monkeypatch, geo={"risk": 0.9, "anomaly": True}, face=ValueError("bad image"))
+    result = authorize(request())
+    assert result["action"] == "DENY"
+    assert result["signals"]["face"]["status"] == "error"
+
+
+def test_face_match_starts_before_slow_signal_finishes(monkeypatch):
+    stub(monkeypatch, geo={"risk": 0.9, "anomaly": True}, behavior_delay=0.1)
+    result = authorize(request())
+    assert result["action"] == "ALLOW"
+    assert CALLS.index("face:start") < CALLS.index("behavior:done")
+
+
+def test_timed_out_signal_counts_as_max_risk(monkeypatch):
+    monkeypatch.setattr(config, "BEHAVIOR_TIMEOUT", 0.01)
+    stub(monkeypatch, behavior_delay=1.0)
+    result = authorize(request(face_image=None))
+    assert result["signals"]["behavior"]["status"] == "timeout"
+    assert result["risk"] == round(config.W_GEO * 0.1 + config.W_BEHAVIOR * 1.0, 3)
+    assert result["action"] == "STEP_UP"
+
+
+def test_errored_signal_counts_as_max_risk(monkeypatch):
+    stub(monkeypatch, geo=KeyError("score"))
+    result = authorize(request(face_image=None))
+    assert result["signals"]["geo"]["status"] == "error"
+    assert result["risk"] == round(config.W_GEO * 1.0 + config.W_BEHAVIOR * 0.1, 3)
+    assert result["action"] == "STEP_UP"
+
+
+def test_mismatched_user_rejected():
+    with pytest.raises(ValueError, match="does not match"):
+        request(buyer="victim", user_id="attacker")